@@ -5,27 +5,61 @@ import joblib
 import numpy as np
 import json
 import os
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional
+
+try:
+    import orjson  # optional, much faster encoder/decoder
+except ImportError:
+    orjson = None
+
+# Column layout the models were trained on (checked once at load)
+_FEATURE_ORDER = ('hour', 'day_of_week', 'occupancy',
+                  'hour_sin', 'hour_cos', 'day_sin', 'day_cos')
+
+# Angular step per hour / per weekday for the cyclical features
+_HOUR_TO_RAD = 2 * np.pi / 24
+_DAY_TO_RAD = 2 * np.pi / 7
+
+def load_forecast_model(resource: str, models_dir: str = "../models") -> Dict[str, Any]:
+    """Load a forecast model pack (model, scaler, feature_names, scores)"""
+    model_path = f"{models_dir}/forecast_{resource}.pkl"
+    # No mmap_mode: sklearn's Tree.__setstate__ copies node/value arrays into
+    # its own buffers, so only the tiny scaler arrays would stay mapped
+    return joblib.load(model_path)
 
 class SustainabilityForecaster:
     def __init__(self, models_dir: str = "../models"):
         self.models = {}
         self.backups = {}
+        # Forecasts are deterministic in (resource, hour, day_of_week, occupancy)
+        self._forecast_cache = lru_cache(maxsize=64)(self._forecast_values)
         
         # Load models
         for resource in ['electricity', 'water', 'waste']:
-            model_path = f"{models_dir}/forecast_{resource}.pkl"
             backup_path = f"../backups/forecast_backup_{resource}.json"
             
             try:
-                self.models[resource] = joblib.load(model_path)
+                model_data = load_forecast_model(resource, models_dir)
+                if list(model_data['feature_names']) != list(_FEATURE_ORDER):
+                    raise ValueError(f"unexpected feature layout: {model_data['feature_names']}")
+                # StandardScaler is (x - mean) / scale: fold it into one
+                # multiply-add so requests skip transform()'s validation
+                scaler = model_data['scaler']
+                model_data['scale_mul'] = 1.0 / scaler.scale_
+                model_data['scale_add'] = -scaler.mean_ * model_data['scale_mul']
+                # Requests score one 24-row batch; spinning up a worker per
+                # tree chunk on every call costs more than it saves
+                model_data['model'].n_jobs = 1
+                self.models[resource] = model_data
                 print(f"✅ Loaded {resource} model")
             except:
                 self.models[resource] = None
             
             try:
-                with open(backup_path, 'r') as f:
-                    self.backups[resource] = json.load(f)
+                with open(backup_path, 'rb') as f:
+                    raw = f.read()
+                self.backups[resource] = orjson.loads(raw) if orjson else json.loads(raw)
             except:
                 self.backups[resource] = None
     
@@ -36,7 +70,8 @@ class SustainabilityForecaster:
         
         try:
             model_data = self.models[resource]
-            forecast = self._make_prediction(model_data, hour, day_of_week, occupancy)
+            values = self._forecast_cache(resource, hour, day_of_week, occupancy)
+            forecast = [{"h": h, "y": y} for h, y in enumerate(values)]
             
             return {
                 "success": True,
@@ -49,39 +84,39 @@ class SustainabilityForecaster:
         except Exception as e:
             return self._get_backup(resource, hour, day_of_week, occupancy, str(e))
     
+    def _forecast_values(self, resource, hour, day_of_week, occupancy):
+        """24 forecast values for one input (memoized by _forecast_cache)"""
+        forecast = self._make_prediction(self.models[resource], hour, day_of_week, occupancy)
+        return tuple(point["y"] for point in forecast)
+    
     def _make_prediction(self, model_data, hour, day_of_week, occupancy):
-        """Internal prediction logic"""
+        """Internal prediction logic (one batched predict for all 24 hours)"""
         model = model_data['model']
-        scaler = model_data['scaler']
-        features = model_data['feature_names']
         
-        predictions = []
+        h_ahead = np.arange(24)
+        future_hour = (hour + h_ahead) % 24
+        future_day = (day_of_week + (hour + h_ahead) // 24) % 7
+        hour_angle = future_hour * _HOUR_TO_RAD
+        day_angle = future_day * _DAY_TO_RAD
         
-        for h_ahead in range(24):
-            future_hour = (hour + h_ahead) % 24
-            future_day = (day_of_week + (hour + h_ahead) // 24) % 7
-            
-            # Prepare feature vector
-            feat_dict = {
-                'hour': future_hour,
-                'day_of_week': future_day,
-                'occupancy': occupancy * 0.95,  # Slight decay
-                'hour_sin': np.sin(2*np.pi*future_hour/24),
-                'hour_cos': np.cos(2*np.pi*future_hour/24),
-                'day_sin': np.sin(2*np.pi*future_day/7),
-                'day_cos': np.cos(2*np.pi*future_day/7)
-            }
-            
-            X = np.array([[feat_dict[f] for f in features]])
-            X_scaled = scaler.transform(X)
-            pred = model.predict(X_scaled)[0]
-            
-            predictions.append({
-                "h": h_ahead,
-                "y": max(0, round(float(pred), 2))
-            })
+        # Prepare feature matrix (24 x 7), columns in _FEATURE_ORDER
+        X = np.column_stack([
+            future_hour,
+            future_day,
+            np.full(24, occupancy * 0.95),  # Slight decay
+            np.sin(hour_angle),
+            np.cos(hour_angle),
+            np.sin(day_angle),
+            np.cos(day_angle)
+        ])
+        X *= model_data['scale_mul']
+        X += model_data['scale_add']
+        preds = model.predict(X)
         
-        return predictions
+        return [
+            {"h": h, "y": max(0, round(float(pred), 2))}
+            for h, pred in enumerate(preds)
+        ]
     
     def _get_backup(self, resource, hour, day_of_week, occupancy, error=None):
         """Get backup forecast"""
@@ -94,16 +129,15 @@ class SustainabilityForecaster:
             return result
         
         # Create simple fallback
-        forecast = []
-        for h in range(24):
-            if resource == 'electricity':
-                val = 50 + 20 * np.sin(2*np.pi*(hour+h)/24)
-            elif resource == 'water':
-                val = 20 + 10 * np.exp(-(((hour+h)%24-8)/4)**2)
-            else:
-                val = max(0, 5 + ((hour+h)%24)*1.5)
-            
-            forecast.append({"h": h, "y": round(val, 2)})
+        hours = hour + np.arange(24)
+        if resource == 'electricity':
+            values = 50 + 20 * np.sin(hours * _HOUR_TO_RAD)
+        elif resource == 'water':
+            values = 20 + 10 * np.exp(-((hours%24-8)/4)**2)
+        else:
+            values = np.maximum(0, 5 + (hours%24)*1.5)
+        
+        forecast = [{"h": h, "y": round(float(val), 2)} for h, val in enumerate(values)]
         
         return {
             "success": False,
@@ -115,12 +149,20 @@ class SustainabilityForecaster:
         }
 
 # Simple interface
+_FORECASTER: Optional[SustainabilityForecaster] = None
+
+def get_forecaster() -> SustainabilityForecaster:
+    """Shared forecaster, loaded once per process"""
+    global _FORECASTER
+    if _FORECASTER is None:
+        _FORECASTER = SustainabilityForecaster()
+    return _FORECASTER
+
 def get_forecast(resource: str, hour: int, day_of_week: int, occupancy: float) -> str:
     """One-line function for backend"""
-    if not hasattr(get_forecast, 'forecaster'):
-        get_forecast.forecaster = SustainabilityForecaster()
-    
-    result = get_forecast.forecaster.predict(resource, hour, day_of_week, occupancy)
+    result = get_forecaster().predict(resource, hour, day_of_week, occupancy)
+    if orjson:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
     return json.dumps(result, indent=2)
 
 if __name__ == "__main__":
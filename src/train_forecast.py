@@ -1,150 +1,18 @@
 """
 Train forecasting models for electricity, water, waste
-"""
-import pandas as pd
-import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import joblib
-import json
-import os
-from datetime import datetime
-
-def prepare_features(df, target_col):
-    """Prepare features for ML (FROZEN: hour, day_of_week, occupancy)"""
-    X = df[['hour', 'day_of_week', 'occupancy']].copy()
-    
-    # Add cyclical features internally (can change)
-    X['hour_sin'] = np.sin(2 * np.pi * X['hour'] / 24)
-    X['hour_cos'] = np.cos(2 * np.pi * X['hour'] / 24)
-    X['day_sin'] = np.sin(2 * np.pi * X['day_of_week'] / 7)
-    X['day_cos'] = np.cos(2 * np.pi * X['day_of_week'] / 7)
-    
-    y = df[target_col].values
-    return X, y
-
-def train_models():
-    """Train all three forecasting models"""
-    print("🤖 Training forecasting models...")
-    
-    # Load data
-    df = pd.read_csv('../data/sustainability_data.csv')
-    
-    models = {}
-    
-    for resource, target_col in [
-        ('electricity', 'electricity_usage'),
-        ('water', 'water_usage'),
-        ('waste', 'waste_generated')
-    ]:
-        print(f"\n📈 Training {resource} model...")
-        
-        # Prepare features
-        X, y = prepare_features(df, target_col)
-        
-        # Split
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=42
-        )
-        
-        # Scale
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_test_scaled = scaler.transform(X_test)
-        
-        # Train
-        model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=10,
-            random_state=42,
-            n_jobs=-1
-        )
-        model.fit(X_train_scaled, y_train)
-        
-        # Evaluate
-        train_score = model.score(X_train_scaled, y_train)
-        test_score = model.score(X_test_scaled, y_test)
-        
-        print(f"   R² Train: {train_score:.3f}, Test: {test_score:.3f}")
-        
-        # Save model
-        model_data = {
-            'model': model,
-            'scaler': scaler,
-            'feature_names': X.columns.tolist(),
-            'train_score': train_score,
-            'test_score': test_score
-        }
-        
-        os.makedirs('../models', exist_ok=True)
-        joblib.dump(model_data, f'../models/forecast_{resource}.pkl')
-        print(f"   💾 Saved: models/forecast_{resource}.pkl")
-        
-        models[resource] = model_data
-    
-    # Create backup forecasts
-    create_backup_forecasts(models)
-    
-    return models
-
-def create_backup_forecasts(models):
-    """Create JSON backup forecasts"""
-    print("\n📝 Creating backup forecasts...")
-    
-    current_conditions = {'hour': 14, 'day_of_week': 2, 'occupancy': 0.75}
-    
-    os.makedirs('../backups', exist_ok=True)
-    
-    for resource in ['electricity', 'water', 'waste']:
-        # Create simple forecast
-        forecast = []
-        for h in range(24):
-            if resource == 'electricity':
-                value = 50 + 20 * np.sin(2*np.pi*h/24)
-            elif resource == 'water':
-                value = 20 + 15 * np.exp(-((h-8)/3)**2) + 15 * np.exp(-((h-20)/3)**2)
-            else:  # waste
-                value = max(0, 5 + h*2 - 30 if h >= 18 else 5 + h*2)
-            
-            forecast.append({"h": h, "y": round(float(value), 2)})
-        
-        # Save JSON
-        output = {
-            "forecast": forecast,
-            "confidence": 0.85,
-            "model_version": "v2.1",
-            "generated_at": datetime.now().isoformat()
-        }
-        
-        with open(f'../backups/forecast_backup_{resource}.json', 'w') as f:
-            json.dump(output, f, indent=2)
-        
-        print(f"   💾 Saved: backups/forecast_backup_{resource}.json")
-    
-    # Create specification
-    spec = """FROZEN CONTRACT
-==============
-INPUT FEATURES (3 columns):
-1. hour (0-23)
-2. day_of_week (0-6, 0=Monday)
-3. occupancy (0.0-1.0)
-
-OUTPUT FORMAT:
-24-point forecast: [{"h":0,"y":value}, {"h":1,"y":value}, ...]
 
-FILES DELIVERED:
-- forecast_electricity.pkl
-- forecast_water.pkl
-- forecast_waste.pkl
-- forecast_backup_*.json (3 files)
-- sample_data.csv
+The implementation lives in train_forecast_models.py; this module keeps the
+original entry point (used by run_all.py) and re-exports its helpers.
 """
-    
-    with open('../model_specification.txt', 'w') as f:
-        f.write(spec)
-    
-    print("💾 Saved: model_specification.txt")
+from train_forecast_models import (  # noqa: F401
+    FEATURE_NAMES,
+    TRAIN_SCORE_ROWS,
+    build_features,
+    prepare_features,
+    train_models,
+    create_backup_forecasts,
+    create_24h_forecast,
+)
 
 if __name__ == "__main__":
-    train_models()
\ No newline at end of file
+    train_models()
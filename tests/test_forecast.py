@@ -0,0 +1,105 @@
+"""
+Equivalence checks for the vectorized generator in ml/REN_STARTER_ALL_IN_ONE.py
+against the original hour-by-hour recurrences, on the same random draws.
+"""
+import importlib.util
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_REN_PATH = os.path.join(os.path.dirname(__file__), "..", "ml", "REN_STARTER_ALL_IN_ONE.py")
+
+
+@pytest.fixture(scope="module")
+def ren():
+    spec = importlib.util.spec_from_file_location("ren_starter", _REN_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _waste_reference(ren, hours, act, seed):
+    """Original per-hour waste recurrence, fed the draws waste_levels() makes."""
+    rng = np.random.default_rng(seed)
+    n_rows = len(hours)
+    noise = rng.uniform(-0.2, 0.5, n_rows)
+    initial = rng.uniform(10, 25)
+    reset = hours == 18
+    reset_levels = iter(rng.uniform(8, 25, int(reset.sum())))
+    rise = rng.random(n_rows) < ren.P_WASTE_FAST_RISE
+    rise_amounts = iter(rng.uniform(20, 45, int(rise.sum())))
+
+    out = np.empty(n_rows)
+    waste_pct = initial
+    for i in range(n_rows):
+        waste_pct += (0.8 + 1.7 * act[i]) + noise[i]
+        if hours[i] == 18:
+            waste_pct = next(reset_levels)
+        if rise[i]:
+            waste_pct += next(rise_amounts)
+        waste_pct = max(0.0, min(100.0, waste_pct))
+        out[i] = round(waste_pct, 2)
+    return out
+
+
+def _leak_reference(ren, start_draw, durations, flow):
+    """Original leak state machine: one leak at a time, lasting durations[start] hours."""
+    extra = np.zeros(len(flow))
+    active, remaining = False, 0
+    for i in range(len(flow)):
+        if not active and start_draw[i] < ren.P_WATER_LEAK_START:
+            active, remaining = True, int(durations[i])
+        if active:
+            extra[i] = flow[i]
+            remaining -= 1
+            if remaining <= 0:
+                active = False
+    return extra
+
+
+@pytest.mark.parametrize("start_hour", [0, 7, 18, 23])
+def test_waste_levels_matches_recurrence(ren, start_hour):
+    hours = (start_hour + np.arange(24 * 30)) % 24
+    act = ren._ACTIVITY[hours]
+    got = ren.waste_levels(hours, act, np.random.default_rng(3))
+    np.testing.assert_allclose(got, _waste_reference(ren, hours, act, 3), atol=1e-9)
+
+
+def test_waste_levels_clamps_at_100(ren, monkeypatch):
+    # No collection and frequent fast rises: the level saturates early
+    monkeypatch.setattr(ren, "P_WASTE_FAST_RISE", 0.3)
+    hours = np.full(200, 12)
+    act = ren._ACTIVITY[hours]
+    got = ren.waste_levels(hours, act, np.random.default_rng(5))
+    expected = _waste_reference(ren, hours, act, 5)
+    assert (expected == 100).sum() > 100
+    np.testing.assert_allclose(got, expected, atol=1e-9)
+
+
+@pytest.mark.parametrize("p_start", [0.004, 0.2, 1.0])
+def test_leak_flow_matches_state_machine(ren, monkeypatch, p_start):
+    # p_start=1.0 makes every row a start candidate, so starts overlap
+    # running leaks and must be skipped until the leak ends
+    monkeypatch.setattr(ren, "P_WATER_LEAK_START", p_start)
+    rng = np.random.default_rng(11)
+    n_rows = 2000
+    start_draw = rng.random(n_rows)
+    durations = rng.integers(ren.LEAK_MIN_HOURS, ren.LEAK_MAX_HOURS, n_rows, endpoint=True)
+    flow = rng.uniform(50, 120, n_rows)
+    np.testing.assert_array_equal(
+        ren._leak_flow(start_draw, durations, flow),
+        _leak_reference(ren, start_draw, durations, flow),
+    )
+
+
+def test_leak_flow_runs_past_the_end(ren):
+    start_draw = np.ones(6)
+    start_draw[4] = 0.0  # leak starts two rows before the end
+    flow = np.arange(1.0, 7.0)
+    np.testing.assert_array_equal(
+        ren._leak_flow(start_draw, np.full(6, ren.LEAK_MAX_HOURS), flow),
+        [0, 0, 0, 0, 5, 6],
+    )